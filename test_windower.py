@@ -7,12 +7,21 @@ Description: This file contains the windower unit tests
 import unittest
 from unittest.mock import patch, mock_open
 import argparse
-import orjson
-import pandas as pd
-import windower
 import io
+import os
+import shutil
+import stat
 import sys
+import tempfile
+import threading
 import logging
+import orjson
+import pandas as pd
+import windower
+import windowing
+
+# os.fstat result of a 100 byte regular file
+REGULAR_FILE_STAT = os.stat_result((stat.S_IFREG,) + (0,) * 5 + (100,) + (0,) * 3)
 
 class TestWindower(unittest.TestCase):
     """
@@ -70,7 +79,7 @@ class TestWindower(unittest.TestCase):
         expected_result = ["ECU1", "ECU2", "ECU3"]
 
         result = windower.parse_ecu_names(test_data)
-        self.assertEqual(sorted(result), sorted(expected_result))
+        self.assertEqual(result, expected_result)
 
     def test_clean_data_removes_unknowns(self):
         """
@@ -109,6 +118,28 @@ class TestWindower(unittest.TestCase):
         ]
         self.assertEqual(windower.clean_data(input_data), expected_output)
 
+    def test_clean_data_dataframe(self):
+        """Test that clean_data filters a DataFrame the same way as a list."""
+        input_data = pd.DataFrame({
+            "name": ["ECU1", "Unknown", None, "unknown2", "ECU2"],
+            "timestamp": [1.0, 2.0, 3.0, 4.0, 5.0]
+        })
+        result = windower.clean_data(input_data)
+        self.assertEqual(result["name"].tolist(), ["ECU1", "ECU2"])
+        self.assertEqual(result["timestamp"].tolist(), [1.0, 5.0])
+
+    def test_clean_data_with_ecu_filter(self):
+        """Test that clean_data also drops ECUs not in the filter, case-insensitively."""
+        input_data = [{"name": "BRAKE"}, {"name": "SPEED"}, {"name": "Unknown"}, {"name": "brake"}]
+        result = windower.clean_data(input_data, ecu_name=["Brake"])
+        self.assertEqual(result, [{"name": "BRAKE"}, {"name": "brake"}])
+
+    def test_parse_ecu_names_dataframe(self):
+        '''Tests that ECU names are extracted from a DataFrame'''
+        test_data = pd.DataFrame({"name": ["ECU1", "ECU2", "ECU1", "ECU3"]})
+        result = windower.parse_ecu_names(test_data)
+        self.assertEqual(result, ["ECU1", "ECU2", "ECU3"])
+
     def test_filter_and_process_data_with_known_ecu(self):
         """
         Tests the functionality of the filter_and_process_data function 
@@ -161,16 +192,56 @@ class TestWindower(unittest.TestCase):
             (-1717678139.6661446, False),
             (0, False),
             (10000000000, False),
-            (9999999999, True)
+            (9999999999, True),
+            (float("nan"), False)
         ]
         for timestamp, expected in test_data:
             self.assertEqual(windower.is_valid_timestamp(timestamp), expected)
 
+    def test_filter_timestamps_match_is_valid_timestamp(self):
+        """Test that filtering keeps exactly the timestamps is_valid_timestamp accepts."""
+        numeric = [1717678139, 1717678139.6661446, -1.0, 0, 10000000000, 9999999999, None]
+        mixed = numeric + ["1717678139", True]
+        for values in (numeric, mixed):
+            input_data = [{"name": "BRAKE", "timestamp": value, "data": "{\"value\": 1}"}
+                          for value in values]
+            expected = [float(value) for value in values if windower.is_valid_timestamp(value)]
+            result = windower.filter_and_process_frame(input_data)
+            self.assertEqual(result["timestamp"].tolist(), expected)
+
+    def test_filter_and_process_frame_missing_timestamp_in_mixed_column(self):
+        """Test that a missing timestamp is skipped when other timestamps are strings."""
+        input_data = [
+            {"name": "BRAKE", "timestamp": 1000.0, "data": "{\"value\": 1}"},
+            {"name": "BRAKE", "data": "{\"value\": 2}"},
+            {"name": "BRAKE", "timestamp": "invalid", "data": "{\"value\": 3}"},
+            {"name": "BRAKE", "timestamp": 1001.5, "data": "{\"value\": 4}"}
+        ]
+        result = windower.filter_and_process_frame(input_data)
+        self.assertEqual(result["timestamp"].tolist(), [1000.0, 1001.5])
+        self.assertEqual(result["value"].tolist(), [1.0, 4.0])
+
+        windows = windower.create_windows(result, window_length=1.0)
+        self.assertEqual(windows["window_start"].tolist(), [1000.0, 1001.0])
+
+    def test_filter_and_process_frame_payload_timestamp(self):
+        """Test that a timestamp signal in the payload does not replace the entry timestamp."""
+        input_data = [
+            {"name": "BRAKE", "timestamp": 1000.0, "data": "{\"timestamp\": 5, \"value\": 1}"},
+            {"name": "BRAKE", "timestamp": 1001.0, "data": "{\"timestamp\": 6}"}
+        ]
+        result = windower.filter_and_process_frame(input_data)
+        self.assertEqual(list(result.columns), ["timestamp", "value"])
+        self.assertEqual(result["timestamp"].tolist(), [1000.0])
+        self.assertEqual(windower.filter_and_process_data(input_data),
+                         [{"timestamp": 1000.0, "value": 1.0}])
+
     def test_get_available_output_options(self):
         '''Test that the function returns the correct list of available output options'''
         result = windower.get_available_output_options()
 
-        expected_result = ["-csv", "--output-csv", "-json", "--output-json"]
+        expected_result = ["-csv", "--output-csv", "-json", "--output-json",
+                           "-parquet", "--output-parquet"]
 
         self.assertEqual(result, expected_result)
 
@@ -184,6 +255,17 @@ class TestWindower(unittest.TestCase):
         self.assertEqual(args.output_csv, "myoutput.csv")
         self.assertIsNone(args.output_json)
 
+    def test_handle_args_reuses_parser(self):
+        '''Tests that the argument parser is built only once.'''
+        with patch("sys.argv", ["windower", "-f", "a.json", "-l", "1"]):
+            first_parser, first_args = windower.handle_args()
+        with patch("sys.argv", ["windower", "-f", "b.json", "-l", "2"]):
+            second_parser, second_args = windower.handle_args()
+        self.assertIs(first_parser, second_parser)
+        self.assertEqual(first_args.file, "a.json")
+        self.assertEqual(second_args.file, "b.json")
+        self.assertEqual(second_args.length, 2.0)
+
     @patch("builtins.open", new_callable=mock_open)
     @patch("windower.logging")
     def test_dict_to_json(self, mock_logging, mock_open_function):
@@ -198,7 +280,7 @@ class TestWindower(unittest.TestCase):
 
         windower.dict_to_json(test_data, json_filename)
 
-        mock_open_function.assert_called_once_with(json_filename, "w", encoding="utf-8", buffering=1)
+        mock_open_function.assert_called_once_with(json_filename, "wb")
 
         handle = mock_open_function()
         handle.write.assert_called_once()
@@ -210,10 +292,10 @@ class TestWindower(unittest.TestCase):
 
     @patch("windower.create_windows", return_value=pd.DataFrame(
             [{'timestamp': 1717678137, 'value': 10}]))
-    @patch("windower.filter_and_process_data", return_value=[
-        {"name": "BRAKE", "timestamp": 1717678137, "BRAKE_AMOUNT": 39.0}])
-    @patch("windower.pd.DataFrame.to_csv")
-    def test_dict_to_csv(self, mock_to_csv, mock_filter_process, mock_create_windows):
+    @patch("windower.filter_and_process_frame", return_value=pd.DataFrame([
+        {"timestamp": 1717678137, "BRAKE_AMOUNT": 39.0}]))
+    @patch("builtins.open", new_callable=mock_open)
+    def test_dict_to_csv(self, mock_open_function, mock_filter_process, mock_create_windows):
         '''Test that the dict_to_csv function correctly processes JSON data, creates windows,
         and saves the results to a CSV file
         '''
@@ -226,24 +308,104 @@ class TestWindower(unittest.TestCase):
         windower.dict_to_csv(test_data, window_length, csv_filename)
         mock_filter_process.assert_called_once_with(test_data, None)
         mock_create_windows.assert_called_once()
-        mock_to_csv.assert_called_once_with(
-            csv_filename, sep=";", index=False, encoding="utf-8-sig")
-
-        args, _ = mock_to_csv.call_args
-        self.assertEqual(args[0], csv_filename)
-
-    @patch("builtins.open", new_callable=mock_open, read_data='[{"name": "TEST", "timestamp": 123, "data": "{\"value\": 42}"}]')
+        mock_open_function.assert_called_once_with(
+            csv_filename, "w", newline="", encoding="utf-8-sig",
+            buffering=windower.CSV_BUFFER_SIZE)
+
+        written = "".join(call.args[0] for call in mock_open_function().write.call_args_list)
+        self.assertEqual(written, "timestamp;value\n1717678137;10\n")
+
+    def test_dict_to_csv_writes_nan_as_empty(self):
+        """Test that NaN statistics are written as empty fields like pandas did."""
+        results = pd.DataFrame([{"window_index": 0, "std_value": float("nan")}])
+        with patch("windower.filter_and_process_frame",
+                   return_value=pd.DataFrame([{"timestamp": 1.0}])), \
+             patch("windower.create_windows", return_value=results), \
+             patch("builtins.open", new_callable=mock_open) as mock_open_function:
+            windower.dict_to_csv([{"name": "ECU1"}], 1.0, "output.csv")
+        written = "".join(call.args[0] for call in mock_open_function().write.call_args_list)
+        self.assertEqual(written, "window_index;std_value\n0;\n")
+
+    @patch("windower.create_windows",
+           return_value=pd.DataFrame([{"window_index": 0, "mean_value": 10.0}]))
+    @patch("windower.filter_and_process_frame",
+           return_value=pd.DataFrame([{"timestamp": 1.0, "value": 10.0}]))
+    @patch("pandas.DataFrame.to_parquet")
+    def test_dict_to_parquet(self, mock_to_parquet, mock_filter_process, mock_create_windows):
+        """Test that dict_to_parquet writes the window statistics with zstd compression."""
+        windower.dict_to_parquet([{"name": "ECU1"}], 1.0, "output")
+        mock_filter_process.assert_called_once()
+        mock_create_windows.assert_called_once()
+        mock_to_parquet.assert_called_once_with("output.parquet", compression="zstd", index=False)
+
+    @patch("windower.create_windows",
+           return_value=pd.DataFrame([{"window_index": 0, "mean_value": 10.0}]))
+    @patch("windower.filter_and_process_frame",
+           return_value=pd.DataFrame([{"timestamp": 1.0, "value": 10.0}]))
+    @patch("pandas.DataFrame.to_parquet", side_effect=ImportError("pyarrow"))
+    def test_dict_to_parquet_without_engine(self, _mock_to_parquet, _mock_filter, _mock_windows):
+        """Test that a missing Parquet engine is logged instead of raised."""
+        with self.assertLogs(level="ERROR") as logs:
+            windower.dict_to_parquet([{"name": "ECU1"}], 1.0, "output.parquet")
+        self.assertIn("pyarrow", logs.output[0])
+
+    @patch("builtins.open", new_callable=mock_open,
+           read_data='[{"name": "TEST", "timestamp": 123, "data": "{\"value\": 42}"}]')
+    @patch("windower.os.fstat", return_value=REGULAR_FILE_STAT)
+    @patch("windower.mmap.mmap")
     @patch("windower.orjson.loads")
-    def test_read_file_success(self, mock_loads, mock_file):
+    def test_read_file_success(self, mock_loads, mock_mmap, _mock_fstat, mock_file):
         """Test successful file reading."""
+        mock_mmap.return_value.__enter__.return_value = b'[]'
         mock_loads.return_value = [{"name": "TEST", "timestamp": 123, "data": "{\"value\": 42}"}]
         result = windower.read_file("test.json")
         self.assertIsNotNone(result)
         self.assertEqual(len(result), 1)
-        self.assertEqual(result[0]["name"], "TEST")
-        mock_file.assert_called_once_with("test.json", "r", encoding="utf-8", buffering=1)
+        self.assertIsInstance(result, pd.DataFrame)
+        self.assertEqual(result["name"].iloc[0], "TEST")
+        mock_file.assert_called_once_with("test.json", "rb")
+        mock_mmap.assert_called_once()
         mock_loads.assert_called_once()
 
+    def test_read_file_from_disk(self):
+        """Test reading the bundled test.json through the memory map."""
+        result = windower.read_file("test.json")
+        self.assertIsInstance(result, pd.DataFrame)
+        self.assertGreater(len(result), 0)
+        self.assertFalse(result["name"].str.lower().str.contains("unknown").any())
+
+    def test_read_file_empty(self):
+        """Test that an empty file is reported as invalid JSON instead of failing to map."""
+        with tempfile.NamedTemporaryFile(suffix=".json") as empty_file:
+            with self.assertLogs(level="ERROR") as logs:
+                result = windower.read_file(empty_file.name)
+        self.assertIsNone(result)
+        self.assertIn("Invalid JSON", logs.output[0])
+
+    def _fifo_path(self, content: bytes) -> str:
+        """Creates a named pipe that gives content once, like a shell process substitution."""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "input.json")
+        os.mkfifo(path)
+
+        def write():
+            with open(path, "wb") as fifo:
+                fifo.write(content)
+
+        writer = threading.Thread(target=write, daemon=True)
+        writer.start()
+        self.addCleanup(writer.join, 5)
+        return path
+
+    @unittest.skipUnless(hasattr(os, "mkfifo"), "named pipes are not supported")
+    def test_read_file_from_pipe(self):
+        """Test that a pipe, which can not be memory-mapped, is read like a regular file."""
+        with open("test.json", "rb") as json_file:
+            content = json_file.read()
+        result = windower.read_file(self._fifo_path(content))
+        pd.testing.assert_frame_equal(result, windower.read_file("test.json"))
+
     @patch("builtins.open", side_effect=FileNotFoundError)
     def test_read_file_not_found(self, mock_file):
         """Test handling of file not found."""
@@ -251,9 +413,12 @@ class TestWindower(unittest.TestCase):
         self.assertIsNone(result)
 
     @patch("builtins.open", new_callable=mock_open, read_data='invalid json')
+    @patch("windower.os.fstat", return_value=REGULAR_FILE_STAT)
+    @patch("windower.mmap.mmap")
     @patch("windower.orjson.loads", side_effect=ValueError("Invalid JSON"))
-    def test_read_file_invalid_json(self, mock_loads, mock_file):
+    def test_read_file_invalid_json(self, mock_loads, mock_mmap, _mock_fstat, mock_file):
         """Test handling of invalid JSON."""
+        mock_mmap.return_value.__enter__.return_value = b'invalid json'
         result = windower.read_file("invalid.json")
         self.assertIsNone(result)
 
@@ -282,6 +447,23 @@ class TestWindower(unittest.TestCase):
         result = windower.safe_parse_json(json_data)
         self.assertEqual(result, {"key": "value", "number": 42})
 
+    def test_safe_parse_json_valid_with_apostrophe(self):
+        """Test that valid JSON is parsed as is, without the single quote replacement."""
+        json_data = '{"key": "driver\'s door", "number": 42}'
+        result = windower.safe_parse_json(json_data)
+        self.assertEqual(result, {"key": "driver's door", "number": 42})
+
+    def test_filter_and_process_data_with_non_object_json(self):
+        """Test that data fields decoding to something else than an object are skipped."""
+        input_data = [
+            {"name": "BRAKE", "timestamp": 1000.0, "data": "1234"},
+            {"name": "BRAKE", "timestamp": 1001.0, "data": "{\"value\": 1}"},
+            {"name": "BRAKE", "timestamp": 1002.0, "data": "{\"value\": 1}"}
+        ]
+        result = windower.filter_and_process_data(input_data)
+        self.assertEqual(result, [{"timestamp": 1001.0, "value": 1.0},
+                                  {"timestamp": 1002.0, "value": 1.0}])
+
     def test_create_windows_basic(self):
         """Test creating windows with basic data."""
         test_data = [
@@ -301,6 +483,19 @@ class TestWindower(unittest.TestCase):
         result = windower.create_windows([], window_length=1.0)
         self.assertTrue(result.empty)
 
+    def test_none_data(self):
+        """Test that None input is reported as missing data instead of raising."""
+        self.assertTrue(windower.create_windows(None, window_length=1.0).empty)
+        with self.assertLogs(level="ERROR") as logs:
+            windower.dict_to_csv(None, 1.0, "output.csv")
+            windower.dict_to_json(None, "output.json", window_length=1.0)
+            windower.dict_to_parquet(None, 1.0, "output.parquet")
+        self.assertEqual(logs.output, [
+            "ERROR:root:No data found from JSON",
+            "ERROR:root:No data to convert to JSON",
+            "ERROR:root:No data found from JSON",
+        ])
+
     def test_create_windows_different_step(self):
         """Test creating windows with a step different from window length."""
         test_data = [
@@ -315,6 +510,74 @@ class TestWindower(unittest.TestCase):
         self.assertEqual(result.iloc[0]["window_start"], 1000.0)
         self.assertEqual(result.iloc[1]["window_start"], 1001.0)
 
+    def test_create_windows_statistics_skip_missing_values(self):
+        """Test window statistics against pandas when signals have gaps and windows overlap."""
+        test_data = pd.DataFrame({
+            "timestamp": [1003.0, 1000.0, 1001.0, 1002.5, 1004.0],
+            "A": [4.0, 1.0, float("nan"), 3.0, 5.0],
+            "B": [float("nan"), 2.0, 6.0, float("nan"), float("nan")]
+        })
+        result = windower.create_windows(test_data, window_length=2.0, step=1.0)
+        self.assertEqual(result["window_start"].tolist(), [1000.0, 1001.0, 1002.0, 1003.0, 1004.0])
+
+        ordered = test_data.sort_values("timestamp")
+        for _, window in result.iterrows():
+            in_window = ordered[(ordered["timestamp"] >= window["window_start"]) &
+                                (ordered["timestamp"] < window["window_end"])]
+            for column in ("A", "B"):
+                for statistic in ("min", "max", "mean", "std"):
+                    expected = in_window[column].agg(statistic)
+                    actual = window[f"{statistic}_{column}"]
+                    if pd.isna(expected):
+                        self.assertTrue(pd.isna(actual))
+                    else:
+                        self.assertAlmostEqual(actual, expected)
+
+    def test_create_windows_statistics_without_overlap(self):
+        """Test window statistics against pandas when windows are back to back."""
+        test_data = pd.DataFrame({
+            "timestamp": [1000.0, 1000.5, 1001.0, 1004.2, 1001.5, 1005.0],
+            "A": [1.0, 2.0, float("nan"), 7.0, 4.0, 5.0]
+        })
+        result = windower.create_windows(test_data, window_length=1.0)
+        self.assertEqual(result["window_start"].tolist(), [1000.0, 1001.0, 1004.0, 1005.0])
+
+        for _, window in result.iterrows():
+            in_window = test_data[(test_data["timestamp"] >= window["window_start"]) &
+                                  (test_data["timestamp"] < window["window_end"])]
+            for statistic in ("min", "max", "mean", "std"):
+                expected = in_window["A"].agg(statistic)
+                actual = window[f"{statistic}_A"]
+                if pd.isna(expected):
+                    self.assertTrue(pd.isna(actual))
+                else:
+                    self.assertAlmostEqual(actual, expected)
+
+    def test_create_windows_sorted_and_shuffled_input(self):
+        """Test that sorted data skips the sort and gives the same windows as shuffled data."""
+        test_data = pd.DataFrame({
+            "timestamp": [1000.0 + i * 0.3 for i in range(30)],
+            "A": [float(i % 7) for i in range(30)]
+        })
+        with patch("windowing.np.argsort", wraps=windowing.np.argsort) as mock_argsort:
+            in_order = windower.create_windows(test_data, window_length=1.0, step=0.5)
+            mock_argsort.assert_not_called()
+        shuffled = windower.create_windows(test_data.sample(frac=1, random_state=0),
+                                           window_length=1.0, step=0.5)
+        pd.testing.assert_frame_equal(in_order, shuffled)
+
+    def test_create_windows_threaded_columns(self):
+        """Test that statistics computed on the thread pool match the serial path."""
+        test_data = [
+            {"timestamp": 1000.0 + i * 0.5, "A": float(i), "B": float(i * i)}
+            for i in range(20)
+        ]
+        with patch("windowing.os.cpu_count", return_value=1):
+            serial = windower.create_windows(test_data, window_length=2.0, step=1.0)
+        with patch("windowing.os.cpu_count", return_value=4):
+            threaded = windower.create_windows(test_data, window_length=2.0, step=1.0)
+        pd.testing.assert_frame_equal(serial, threaded)
+
     def test_create_windows_with_no_timestamp_column(self):
         """Test creating windows with data that has no timestamp column."""
         test_data = [
@@ -336,18 +599,25 @@ class TestWindower(unittest.TestCase):
 
     def test_check_output_options_true(self):
         """Test check_output_options returns True when output options are specified."""
-        mock_args = argparse.Namespace(output_csv="output.csv", output_json=None)
+        mock_args = argparse.Namespace(output_csv="output.csv", output_json=None,
+                                       output_parquet=None)
         self.assertTrue(windower.check_output_options(mock_args))
         
-        mock_args = argparse.Namespace(output_csv=None, output_json="output.json")
+        mock_args = argparse.Namespace(output_csv=None, output_json="output.json",
+                                       output_parquet=None)
         self.assertTrue(windower.check_output_options(mock_args))
         
-        mock_args = argparse.Namespace(output_csv="output.csv", output_json="output.json")
+        mock_args = argparse.Namespace(output_csv="output.csv", output_json="output.json",
+                                       output_parquet=None)
+        self.assertTrue(windower.check_output_options(mock_args))
+
+        mock_args = argparse.Namespace(output_csv=None, output_json=None,
+                                       output_parquet="output.parquet")
         self.assertTrue(windower.check_output_options(mock_args))
 
     def test_check_output_options_false(self):
         """Test check_output_options returns False when no output options are specified."""
-        mock_args = argparse.Namespace(output_csv=None, output_json=None)
+        mock_args = argparse.Namespace(output_csv=None, output_json=None, output_parquet=None)
         self.assertFalse(windower.check_output_options(mock_args))
 
     @patch("logging.Logger.setLevel")
@@ -373,6 +643,35 @@ class TestWindower(unittest.TestCase):
         
         self.assertEqual(mock_add_handler.call_count, 4)
 
+    def test_log_setup_single_handler(self):
+        """Test that repeated log setup adds one console handler."""
+        root = logging.getLogger()
+        saved_handlers, saved_level = root.handlers[:], root.level
+        root.handlers[:] = []
+        try:
+            windower.log_setup('debug')
+            windower.log_setup('quiet')
+            self.assertEqual(root.handlers, [windower.console_log_handler()])
+            self.assertEqual(root.level, logging.ERROR)
+        finally:
+            root.handlers[:] = saved_handlers
+            root.setLevel(saved_level)
+
+    def test_log_setup_existing_stream_handler(self):
+        """Test that log setup keeps an existing StreamHandler and logs each message once."""
+        root = logging.getLogger()
+        saved_handlers, saved_level = root.handlers[:], root.level
+        stream = io.StringIO()
+        root.handlers[:] = [logging.StreamHandler(stream)]
+        try:
+            windower.log_setup('info')
+            logging.info("message")
+            self.assertEqual(len(root.handlers), 1)
+            self.assertEqual(stream.getvalue(), "message\n")
+        finally:
+            root.handlers[:] = saved_handlers
+            root.setLevel(saved_level)
+
     @patch("windower.dict_to_csv")
     @patch("windower.dict_to_json")
     @patch("windower.read_file")
@@ -399,21 +698,69 @@ class TestWindower(unittest.TestCase):
             mock_dict_to_csv.assert_not_called()
             mock_dict_to_json.assert_called_once()
 
-    @patch("windower.parse_ecu_names")
+    @patch("windower.dict_to_csv")
+    @patch("windower.read_file", return_value=pd.DataFrame())
+    @patch("sys.argv",
+           ["windower.py", "-f", "test.json", "-l", "10", "-e", "NOPE", "--output-csv", "out.csv"])
+    def test_main_ecu_filter_matches_nothing(self, mock_read_file, mock_dict_to_csv):
+        """Test main function when the ECU filter matches no entries."""
+        with self.assertLogs(level="ERROR") as logs:
+            windower.main()
+        self.assertEqual(logs.output, ["ERROR:root:No entries match the ECU filter: NOPE"])
+        mock_read_file.assert_called_once_with("test.json", ["NOPE"])
+        mock_dict_to_csv.assert_not_called()
+
+    @patch("windower.stream_ecu_names")
     @patch("windower.read_file")
     @patch("sys.argv", ["windower.py", "-f", "test.json", "-list"])
     @patch("builtins.print")
-    def test_main_list_ecus(self, mock_print, mock_read_file, mock_parse_ecu_names):
+    def test_main_list_ecus(self, mock_print, mock_read_file, mock_stream_ecu_names):
         """Test main function with list ECUs option."""
-        mock_read_file.return_value = [{"name": "ECU1"}, {"name": "ECU2"}]
-        mock_parse_ecu_names.return_value = ["ECU1", "ECU2"]
+        mock_stream_ecu_names.return_value = ["ECU1", "ECU2"]
         
         windower.main()
-        mock_parse_ecu_names.assert_called_once()
+        mock_stream_ecu_names.assert_called_once_with("test.json")
+        mock_read_file.assert_not_called()
         mock_print.assert_called_once()
         self.assertTrue("ECU1" in mock_print.call_args[0][0])
         self.assertTrue("ECU2" in mock_print.call_args[0][0])
 
+    def test_stream_ecu_names(self):
+        """Test that only the top-level names of the entries are listed."""
+        content = (b'[{"name": "BRAKE", "data": "{\\"name\\": \\"INNER\\"}",'
+                   b' "meta": {"name": "NESTED"}},'
+                   b' {"name" : "Unknown"}, {"name": "SP\\"EED"}, {"name": "BRAKE"},'
+                   b' {"name": ""}, {"name": 5}, {"timestamp": 1}]')
+        with tempfile.NamedTemporaryFile(suffix=".json") as json_file:
+            json_file.write(content)
+            json_file.flush()
+            result = windower.stream_ecu_names(json_file.name)
+        self.assertEqual(result, ["BRAKE", 'SP"EED'])
+
+    def test_stream_ecu_names_invalid_escape(self):
+        """Test that a name with an invalid escape is reported as invalid JSON."""
+        with tempfile.NamedTemporaryFile(suffix=".json") as json_file:
+            json_file.write(b'[{"name": "A\\q"}]')
+            json_file.flush()
+            with self.assertLogs(level="ERROR") as logs:
+                result = windower.stream_ecu_names(json_file.name)
+        self.assertIsNone(result)
+        self.assertIn("Invalid JSON", logs.output[0])
+
+    @unittest.skipUnless(hasattr(os, "mkfifo"), "named pipes are not supported")
+    def test_stream_ecu_names_from_pipe(self):
+        """Test that names are listed from a pipe, which can not be memory-mapped."""
+        with open("can_dump.json", "rb") as json_file:
+            content = json_file.read()
+        result = windower.stream_ecu_names(self._fifo_path(content))
+        self.assertEqual(result, windower.stream_ecu_names("can_dump.json"))
+        self.assertGreater(len(result), 0)
+
+    def test_stream_ecu_names_matches_read_file(self):
+        """Test that listing gives the same names as reading and parsing the file."""
+        expected = windower.parse_ecu_names(windower.read_file("can_dump.json"))
+        self.assertEqual(windower.stream_ecu_names("can_dump.json"), expected)
+
     @patch("windower.read_file")
     @patch("sys.argv", ["windower.py", "-f", "test.json", "-l", "10"])
     @patch("builtins.print")
@@ -426,18 +773,18 @@ class TestWindower(unittest.TestCase):
         output_message = mock_print.call_args[0][0]
         self.assertTrue("Error: No output format specified" in output_message)
         
-    @patch("windower.filter_and_process_data")
+    @patch("windower.filter_and_process_frame")
     def test_dict_to_json_empty_filtered_data(self, mock_filter):
         """Test dict_to_json with window processing but empty filtered data."""
-        mock_filter.return_value = []
+        mock_filter.return_value = pd.DataFrame()
         test_data = [{"name": "ECU1", "timestamp": 1000.0}]
         windower.dict_to_json(test_data, "output.json", window_length=2.0)
         mock_filter.assert_called_once()
         
-    @patch("windower.filter_and_process_data", return_value=[
+    @patch("windower.filter_and_process_frame", return_value=pd.DataFrame([
         {"timestamp": 1000.0, "value": 10},
         {"timestamp": 1001.0, "value": 20}
-    ])
+    ]))
     @patch("windower.create_windows", return_value=pd.DataFrame())
     def test_dict_to_json_empty_windows(self, mock_windows, mock_filter):
         """Test dict_to_json with window processing but empty window results."""
@@ -446,25 +793,27 @@ class TestWindower(unittest.TestCase):
         mock_filter.assert_called_once()
         mock_windows.assert_called_once()
         
-    @patch("windower.filter_and_process_data", return_value=[])
+    @patch("windower.filter_and_process_frame", return_value=pd.DataFrame())
     def test_dict_to_csv_empty_filtered_data(self, mock_filter):
-        """Test dict_to_csv with empty filtered data."""
+        """Test dict_to_csv with empty filtered data, which is not logged as an error."""
         test_data = [{"name": "ECU1", "timestamp": 1000.0}]
-        windower.dict_to_csv(test_data, 2.0, "output.csv")
+        with self.assertNoLogs(level="ERROR"):
+            windower.dict_to_csv(test_data, 2.0, "output.csv")
         mock_filter.assert_called_once()
         
-    @patch("windower.filter_and_process_data", return_value=[
+    @patch("windower.filter_and_process_frame", return_value=pd.DataFrame([
         {"timestamp": 1000.0, "value": 10}
-    ])
+    ]))
     @patch("windower.create_windows", return_value=pd.DataFrame())
-    @patch("windower.pd.DataFrame.to_csv")
-    def test_dict_to_csv_empty_windows(self, mock_to_csv, mock_windows, mock_filter):
-        """Test dict_to_csv with empty window results."""
+    @patch("builtins.open", new_callable=mock_open)
+    def test_dict_to_csv_empty_windows(self, mock_open_function, mock_windows, mock_filter):
+        """Test dict_to_csv with empty window results, which is not logged as an error."""
         test_data = [{"name": "ECU1", "timestamp": 1000.0}]
-        windower.dict_to_csv(test_data, 2.0, "output.csv")
+        with self.assertNoLogs(level="ERROR"):
+            windower.dict_to_csv(test_data, 2.0, "output.csv")
         mock_filter.assert_called_once()
         mock_windows.assert_called_once()
-        mock_to_csv.assert_not_called()
+        mock_open_function.assert_not_called()
         
     def test_filter_and_process_data_with_non_numeric_values(self):
         """Test filter_and_process_data with non-numeric values in the data field."""
@@ -490,6 +839,21 @@ class TestWindower(unittest.TestCase):
         result = windower.filter_and_process_data(input_data)
         self.assertEqual(result, [])
         
+    def test_filter_and_process_frame(self):
+        """Test that filter_and_process_frame builds one column per signal with NaN gaps."""
+        input_data = [
+            {"name": "BRAKE", "timestamp": 1000.0, "data": "{\"BRAKE_AMOUNT\": 39}"},
+            {"name": "SPEED", "timestamp": 1001.0, "data": "{\"SPEED\": 15.48}"},
+            {"name": "BRAKE", "timestamp": "invalid", "data": "{\"BRAKE_AMOUNT\": 40}"}
+        ]
+        result = windower.filter_and_process_frame(input_data)
+        self.assertEqual(list(result.columns), ["timestamp", "BRAKE_AMOUNT", "SPEED"])
+        self.assertEqual(result["timestamp"].tolist(), [1000.0, 1001.0])
+        self.assertEqual(result["BRAKE_AMOUNT"].iloc[0], 39.0)
+        self.assertTrue(pd.isna(result["BRAKE_AMOUNT"].iloc[1]))
+        self.assertTrue(pd.isna(result["SPEED"].iloc[0]))
+        self.assertEqual(result["SPEED"].iloc[1], 15.48)
+
     @patch("sys.argv", ["windower.py", "-f", "test.json", "-list", "--output-csv", "out.csv"])
     def test_handle_args_with_incompatible_options(self):
         """Test handle_args with incompatible options (list-ecus with output options)."""
@@ -498,7 +862,8 @@ class TestWindower(unittest.TestCase):
             
     @patch("windower.dict_to_csv")
     @patch("windower.read_file", return_value=None)
-    @patch("sys.argv", ["windower.py", "-f", "nonexistent.json", "-l", "10", "--output-csv", "out.csv"])
+    @patch("sys.argv",
+           ["windower.py", "-f", "nonexistent.json", "-l", "10", "--output-csv", "out.csv"])
     def test_main_with_file_error(self, mock_read_file, mock_dict_to_csv):
         """Test main function with file read error."""
         windower.main()
@@ -5,10 +5,11 @@ Description: Visualizes benchmark results from the windower benchmarks
 
 import argparse
 import json
+import os
+import matplotlib
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
-import os
 from matplotlib.ticker import FuncFormatter
 
 def format_number(x, pos):
@@ -24,34 +25,39 @@ def format_time(x, pos):
     else:
         return f'{x:.2f} s'
 
+def finish_figure(fig, show=False):
+    """Show the figure if requested, then release it from pyplot."""
+    if show:
+        plt.show()
+    plt.close(fig)
+
 def load_results(filename):
     with open(filename, 'r') as f:
         results = json.load(f)
     return results
 
 def create_comparison_dataframe(results):
-    data = []
-    for result in results:
-        data.append({
-            'data_size': result['data_size'],
-            'filter_time': result['filter_time_stats']['mean'],
-            'filter_memory': result['filter_memory_stats']['mean'],
-            'windows_time': result['create_windows_time_stats']['mean'],
-            'windows_memory': result['create_windows_memory_stats']['mean'],
-            'windows_generated': result['windows_generated'],
-            'total_time': result['filter_time_stats']['mean'] + result['create_windows_time_stats']['mean'],
-            'peak_memory': max(result['filter_memory_stats']['peak'], result['create_windows_memory_stats']['peak'])
-        })
-    return pd.DataFrame(data)
+    # Flatten the nested stats into columns like filter_time_stats_mean
+    flat = pd.json_normalize(results, sep='_')
+    df = pd.DataFrame({
+        'data_size': flat['data_size'],
+        'filter_time': flat['filter_time_stats_mean'],
+        'filter_memory': flat['filter_memory_stats_mean'],
+        'windows_time': flat['create_windows_time_stats_mean'],
+        'windows_memory': flat['create_windows_memory_stats_mean'],
+        'windows_generated': flat['windows_generated']
+    })
+    df['total_time'] = df['filter_time'] + df['windows_time']
+    df['peak_memory'] = np.maximum(flat['filter_memory_stats_peak'],
+                                   flat['create_windows_memory_stats_peak'])
+    return df
 
-def plot_time_comparison(df, output_file=None):
-    plt.figure(figsize=(12, 8))
+def plot_time_comparison(df, output_file=None, show=False):
+    fig, ax = plt.subplots(figsize=(12, 8))
     
     x = np.arange(len(df))
     width = 0.35
     
-    ax = plt.subplot(111)
-    
     filter_bars = ax.bar(x - width/2, df['filter_time'], width, label='filter_and_process_data()')
     windows_bars = ax.bar(x + width/2, df['windows_time'], width, label='create_windows()')
     
@@ -63,39 +69,23 @@ def plot_time_comparison(df, output_file=None):
     ax.legend()
     
     # Add the time values on top of each bar
-    def add_labels(bars):
-        for bar in bars:
-            height = bar.get_height()
-            if height < 0.001:
-                label = f"{height*1000:.2f} μs"
-            elif height < 1:
-                label = f"{height*1000:.2f} ms"
-            else:
-                label = f"{height:.2f} s"
-            ax.annotate(label,
-                        xy=(bar.get_x() + bar.get_width() / 2, height),
-                        xytext=(0, 3),  # 3 points vertical offset
-                        textcoords="offset points",
-                        ha='center', va='bottom', rotation=90)
-    
-    add_labels(filter_bars)
-    add_labels(windows_bars)
+    for bars in (filter_bars, windows_bars):
+        ax.bar_label(bars, labels=[format_time(bar.get_height(), None) for bar in bars],
+                     padding=3, rotation=90)
     
     plt.tight_layout()
     
     if output_file:
         plt.savefig(output_file)
     
-    plt.show()
+    finish_figure(fig, show)
 
-def plot_memory_comparison(df, output_file=None):
-    plt.figure(figsize=(12, 8))
+def plot_memory_comparison(df, output_file=None, show=False):
+    fig, ax = plt.subplots(figsize=(12, 8))
     
     x = np.arange(len(df))
     width = 0.35
     
-    ax = plt.subplot(111)
-    
     filter_bars = ax.bar(x - width/2, df['filter_memory'], width, label='filter_and_process_data()')
     windows_bars = ax.bar(x + width/2, df['windows_memory'], width, label='create_windows()')
     
@@ -107,26 +97,17 @@ def plot_memory_comparison(df, output_file=None):
     ax.legend()
     
     # Add the memory values on top of each bar
-    def add_labels(bars):
-        for bar in bars:
-            height = bar.get_height()
-            ax.annotate(f"{height:.1f} MB",
-                        xy=(bar.get_x() + bar.get_width() / 2, height),
-                        xytext=(0, 3),  # 3 points vertical offset
-                        textcoords="offset points",
-                        ha='center', va='bottom', rotation=90)
-    
-    add_labels(filter_bars)
-    add_labels(windows_bars)
+    for bars in (filter_bars, windows_bars):
+        ax.bar_label(bars, fmt="%.1f MB", padding=3, rotation=90)
     
     plt.tight_layout()
     
     if output_file:
         plt.savefig(output_file)
     
-    plt.show()
+    finish_figure(fig, show)
 
-def plot_scaling(df, output_file=None):
+def plot_scaling(df, output_file=None, show=False):
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 8))
     
     # Time scaling plot
@@ -163,7 +144,7 @@ def plot_scaling(df, output_file=None):
     if output_file:
         plt.savefig(output_file)
     
-    plt.show()
+    finish_figure(fig, show)
 
 def main():
     parser = argparse.ArgumentParser(description="Visualize windower benchmark results")
@@ -171,8 +152,14 @@ def main():
                         help="Input benchmark results file (default: benchmark_results.json)")
     parser.add_argument("-o", "--output-dir", type=str, default="benchmark_images",
                         help="Output directory for visualization files (default: benchmark_images)")
+    parser.add_argument("--show", action="store_true",
+                        help="Also display the plots in a window after saving them")
     args = parser.parse_args()
     
+    # Without a window to open, render straight to files
+    if not args.show:
+        matplotlib.use("Agg")
+    
     # Ensure output directory exists
     os.makedirs(args.output_dir, exist_ok=True)
     
@@ -184,9 +171,9 @@ def main():
     print(df.to_string(index=False, float_format=lambda x: f"{x:.6f}" if x < 1 else f"{x:.2f}"))
     
     # Create visualizations and save to output directory
-    plot_time_comparison(df, os.path.join(args.output_dir, "time_comparison.png"))
-    plot_memory_comparison(df, os.path.join(args.output_dir, "memory_comparison.png"))
-    plot_scaling(df, os.path.join(args.output_dir, "scaling.png"))
+    plot_time_comparison(df, os.path.join(args.output_dir, "time_comparison.png"), args.show)
+    plot_memory_comparison(df, os.path.join(args.output_dir, "memory_comparison.png"), args.show)
+    plot_scaling(df, os.path.join(args.output_dir, "scaling.png"), args.show)
     
     print(f"\nVisualizations saved to directory: {args.output_dir}")
 
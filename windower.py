@@ -5,12 +5,21 @@ Authors: Johan Sääskilahti, Atte Rajavaara, Minna Repo, Topias Hämäläinen
 Description: This tool was designed to create windows from preprocessed JSON data
 """
 
+import os
+import csv
 import sys
 import argparse
+import functools
 import logging
-from typing import List, Dict, Optional, Any
+import mmap
+import stat
+from contextlib import contextmanager
+from itertools import compress
+from typing import List, Dict, Optional, Any, Callable
+import numpy as np
 import pandas as pd
 import orjson
+from windowing import Records, create_windows
 
 
 DESC = r"""
@@ -23,73 +32,142 @@ DESC = r"""
                          windows made quick and easy
 """
 
+# Format of logs and date
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+DATE_FORMAT = "%d.%m.%Y %H:%M:%S"
 
-def clean_data(data: List[Dict]) -> List[Dict]:
+# Write buffer size for CSV output
+CSV_BUFFER_SIZE = 1 << 20
+# Latest accepted Unix timestamp, approx year 2286
+MAX_TIMESTAMP = 9999999999
+
+
+def _match_names(names: np.ndarray, predicate: Callable[[Any], bool]) -> np.ndarray:
+    """
+    Applies predicate to a column of ECU names.
+    CAN logs repeat a handful of ECU names, so the names are factorized and
+    the predicate is called once per distinct name, the result is
+    broadcast back with the codes.
+
+    Args:
+        names: Object array of ECU names.
+        predicate: Returns True for names to keep.
+
+    Returns:
+        np.ndarray: Boolean mask, missing names are never kept.
+    """
+    codes, uniques = pd.factorize(names, use_na_sentinel=True)
+    # Code -1 (missing name) picks the trailing False
+    matches = np.array([predicate(name) for name in uniques] + [False], dtype=bool)
+    return matches[codes]
+
+def clean_data(data: Records, ecu_name: Optional[List[str]] = None) -> Records:
     """
     This  function filters out
     entries where the name field is 'Unknown', 'unknown', or any other
     case-insensitive variation of the word 'unknown'.
 
     Args:
-        data : List of dictionaries containing ECU information.
+        data : List of dictionaries or a DataFrame containing ECU information.
+        ecu_name: Optionally keep only these ECU names (case-insensitive).
 
     Returns:
-        list: A cleaned dict which contains only data of known ECUs.
+        A cleaned list or DataFrame (same type as data) which contains only data of known ECUs.
     """
-    cleaned_data = []
-    for row in data:
-        name = row.get("name")
-        if not name:
-            continue
-        # Ensure name is a string
-        name = name.lower() if isinstance(name, str) else str(name).lower()
-        if "unknown" not in name:
-            cleaned_data.append(row)
-    return cleaned_data
+    is_frame = isinstance(data, pd.DataFrame)
+    if len(data) == 0 or (is_frame and "name" not in data.columns):
+        return data.iloc[0:0] if is_frame else []
+    if is_frame:
+        names = data["name"].to_numpy(dtype=object)
+    else:
+        names = np.array([row.get("name") for row in data], dtype=object)
+    ecu_filters = frozenset(name.lower() for name in ecu_name) if ecu_name else None
 
-def parse_ecu_names(data: List[Dict]) -> list:
+    def is_known(name: Any) -> bool:
+        lowered = name.lower() if isinstance(name, str) else str(name).lower()
+        return (bool(name) and "unknown" not in lowered
+                and (ecu_filters is None or lowered in ecu_filters))
+
+    keep = _match_names(names, is_known)
+    if is_frame:
+        return data[keep].reset_index(drop=True)
+    return list(compress(data, keep))
+
+def parse_ecu_names(data: Records) -> list:
     """
     clean_data function has been executed before this.
     This function is used to extract the names of ECUs from the JSON data.
     Args:
-        data : List of dictionaries containing ECU information.
+        data : List of dictionaries or a DataFrame containing ECU information.
 
     Returns:
-        list: A list of ECU names found in the data.
+        list: A list of ECU names found in the data, in order of appearance.
     """
     logging.debug("Extracting ECU names from JSON data")
     #logging.debug("Data: %s", data)
-    ecu_names = set()
+    if isinstance(data, pd.DataFrame):
+        ecu_names = data["name"].unique().tolist() if "name" in data.columns else []
+        logging.debug("ECU names extracted")
+        return ecu_names
 
-    for row in data:
-        name = row.get("name")  # Extract name field
-        ecu_names.add(name)
+    # dict keeps the names in order of appearance
+    ecu_names = list(dict.fromkeys(row.get("name") for row in data if row.get("name")))
 
     logging.debug("ECU names extracted")
-    return list(ecu_names)
+    return ecu_names
 
-def read_file(file_name: str) -> Optional[List[Dict]]:
+@contextmanager
+def _file_content(file):
     """
-    This function reads a JSON file and converts it into a Python object using orjson.
+    Gives the content of a file opened in binary mode.
+    Regular files are memory-mapped. Pipes, process substitution and other
+    streams can not be mapped, so they are read into bytes instead, as are
+    empty files, which mmap rejects.
+
+    Args:
+        file: File object opened with "rb".
+
+    Yields:
+        The memory-mapped file or its bytes.
+    """
+    info = os.fstat(file.fileno())
+    if stat.S_ISREG(info.st_mode) and info.st_size > 0:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+    else:
+        yield file.read()
+
+def read_file(file_name: str, ecu_name: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+    """
+    This function reads a JSON file and converts it into a DataFrame using orjson.
     Args:
         file_name (str): Path to the JSON file.
+        ecu_name (Optional[List[str]]): Keep only entries of these ECUs.
     Returns:
-        Optional[List[Dict]]: Parsed JSON data as a Python object or None if an error occurs.
+        Optional[pd.DataFrame]: Cleaned data with one column per field
+        (name, timestamp, data, ...) or None if an error occurs.
     Note:
         - The file must be a valid JSON.
         - orjson is used instead of the built-in json module due to its
           performance benefits, especially for large files.
+        - The data is kept columnar from here on, the rest of the
+          pipeline works on whole columns instead of a dict per entry.
+        - Unknown and filtered out ECUs are dropped before the DataFrame is
+          built, so their entries are never copied into columns nor have
+          their data field parsed.
     """
     logging.info("Reading JSON file: %s", file_name)
     try:
-        # Non-buffered reading
-        with open(file_name, "r", encoding="utf-8", buffering=1) as file:
-            data = orjson.loads(file.read())
+        # orjson parses the mapped bytes directly, without first copying
+        # the whole file into a bytes object
+        with open(file_name, "rb") as file, _file_content(file) as content, \
+                memoryview(content) as view:
+            data = orjson.loads(view)
             logging.debug("%s read successfully!", file_name)
             logging.debug("Cleaning data...")
-            cleaned_data = clean_data(data)
+            cleaned_data = clean_data(data, ecu_name)
             logging.debug("Data cleaned!")
-            return cleaned_data
+            return pd.DataFrame(cleaned_data)
     except FileNotFoundError:
         logging.error("Error: The file '%s' was not found.", file_name)
     except orjson.JSONDecodeError as e:
@@ -98,16 +176,47 @@ def read_file(file_name: str) -> Optional[List[Dict]]:
         logging.error("Unexpected error reading file '%s': %s", file_name, e)
     return None
 
-def handle_args() -> tuple[argparse.ArgumentParser, argparse.Namespace]:
+def stream_ecu_names(file_name: str) -> Optional[List[str]]:
     """
-    This function parses the arguments
+    This function lists the known ECU names of a JSON file without building a DataFrame.
+    Only the name field of each entry is read from the parsed file, the
+    entries are not cleaned nor copied into columns. Used by -list / --list-ecus.
+    Args:
+        file_name (str): Path to the JSON file.
     Returns:
-        Argument parser object
-        Parsed args
+        Optional[List[str]]: Distinct known ECU names in order of appearance,
+        or None if the file can not be read.
     Note:
-        The return can seem a bit funny. However, it makes sure that
-        if the tool is ran without args, it will print the help message.
-        This is because argparse does not support this out of the box.
+        Names that are not strings (e.g. numbers) are not listed.
+    """
+    logging.info("Reading ECU names from JSON file: %s", file_name)
+    try:
+        with open(file_name, "rb") as file, _file_content(file) as content, \
+                memoryview(content) as view:
+            data = orjson.loads(view)
+    except FileNotFoundError:
+        logging.error("Error: The file '%s' was not found.", file_name)
+        return None
+    except orjson.JSONDecodeError as e:
+        logging.error("Error: Invalid JSON in file '%s': %s", file_name, e)
+        return None
+    except (OSError, ValueError) as e:
+        logging.error("Unexpected error reading file '%s': %s", file_name, e)
+        return None
+
+    # Only top-level entries are ECU entries, names nested inside them are not
+    entries = data if isinstance(data, list) else []
+    names = dict.fromkeys(entry.get("name") for entry in entries if isinstance(entry, dict))
+    return [name for name in names
+            if isinstance(name, str) and name and "unknown" not in name.lower()]
+
+@functools.cache
+def _build_parser() -> argparse.ArgumentParser:
+    """
+    Builds the argument parser. The parser is built once and reused
+    by every later handle_args call.
+    Returns:
+        Argument parser object
     """
     parser = argparse.ArgumentParser(description=DESC, prog='windower.py',
                                      formatter_class=argparse.RawTextHelpFormatter)
@@ -115,6 +224,8 @@ def handle_args() -> tuple[argparse.ArgumentParser, argparse.Namespace]:
                         required=True)
     parser.add_argument('-csv', '--output-csv', type=str, help='Output file name')
     parser.add_argument('-json', '--output-json', type=str, help='Output file name')
+    parser.add_argument('-parquet', '--output-parquet', type=str,
+                        help='Output file name, needs pyarrow to be installed')
     parser.add_argument('-list', '--list-ecus', action='store_true', help='List ECU names, can only be used with file and optional logging argument')
     parser.add_argument('-e', '--ecu', nargs='+', help='Filter data by specific ECU name(s)')
     parser.add_argument('-l', '--length', type=float, help='Window length in seconds')
@@ -129,12 +240,26 @@ def handle_args() -> tuple[argparse.ArgumentParser, argparse.Namespace]:
     log_level.add_argument('-q', '--quiet', action= 'store_true',
                            help='Show only ERRORs, default: INFO logging')
 
+    return parser
+
+def handle_args() -> tuple[argparse.ArgumentParser, argparse.Namespace]:
+    """
+    This function parses the arguments
+    Returns:
+        Argument parser object
+        Parsed args
+    Note:
+        The return can seem a bit funny. However, it makes sure that
+        if the tool is ran without args, it will print the help message.
+        This is because argparse does not support this out of the box.
+    """
+    parser = _build_parser()
     args = parser.parse_args(args=None if sys.argv[1:] else ['--help'])
 
     #-list/--list-ecus can only be used with file and optional logging level (only -f/--file, -list/--list-ecus and log loglevel)
     if args.list_ecus:
         other_args = any([
-            args.output_csv, args.output_json,
+            args.output_csv, args.output_json, args.output_parquet,
             args.ecu, args.length, args.step
         ])
         if other_args:
@@ -142,6 +267,17 @@ def handle_args() -> tuple[argparse.ArgumentParser, argparse.Namespace]:
 
     return parser, args
 
+@functools.cache
+def console_log_handler() -> logging.Handler:
+    """
+    Returns the handler for console logging. It is created on the first
+    call, so it writes to the sys.stderr of that moment, and shared by
+    every later log_setup call.
+    """
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(logging.Formatter(LOG_FORMAT, datefmt=DATE_FORMAT))
+    return console_handler
+
 def log_setup(level: str):
     """
     Setup for logger.
@@ -149,10 +285,11 @@ def log_setup(level: str):
     info = default, show everything above INFO level
     debug = log everything
     quiet = only print errors
+    Note:
+        The shared console handler is added only if the root logger has no
+        handlers yet, so later calls and existing logging setups only change the level.
     """
 
-    logger = logging.getLogger()
-
     logging_levels = {
         'info': logging.INFO,
         'debug': logging.DEBUG,
@@ -160,20 +297,13 @@ def log_setup(level: str):
     }
 
     log_level = logging_levels.get(level, logging.INFO)
-    logger.setLevel(log_level)
-
-    # Format of logs and date
-    log_format = "%(asctime)s - %(levelname)s - %(message)s"
-    date_format = "%d.%m.%Y %H:%M:%S"
 
-    # Handler for console logging
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(logging.Formatter(log_format, datefmt=date_format))
-    console_handler.setLevel(log_level)
+    logger = logging.getLogger()
+    logger.setLevel(log_level)
 
     # Add the handler if logger is empty (no handlers added already)
     if not logger.hasHandlers():
-        logger.addHandler(console_handler)
+        logger.addHandler(console_log_handler())
 
 def safe_parse_json(raw_data: str) -> Optional[Dict]:
     """
@@ -188,6 +318,12 @@ def safe_parse_json(raw_data: str) -> Optional[Dict]:
     if not raw_data or not isinstance(raw_data, str):
         return None
 
+    # Well-formed JSON is parsed as is, without copying the string first
+    try:
+        return orjson.loads(raw_data)
+    except orjson.JSONDecodeError:
+        pass
+
     # Try to clean up the data before parsing
     cleaned_data = raw_data.strip()
 
@@ -223,178 +359,249 @@ def is_valid_timestamp(timestamp: Any) -> bool:
         return False
 
     # Check if timestamp is within a reasonable range
-    # Unix timestamp should be positive and not too far in the future
-    if timestamp <= 0 or timestamp > 9999999999:  # Approx year 2286
+    # Unix timestamp should be positive and not too far in the future, NaN is never in range
+    if not 0 < timestamp <= MAX_TIMESTAMP:
         return False
 
     return True
 
-def filter_and_process_data(data: List[Dict], ecu_name: List[str] = None) -> List[Dict]:
+def _valid_timestamp_mask(timestamps: pd.Series) -> np.ndarray:
     """
-    Filter and process data based on ECU name and convert data fields to numeric values.
-    Handles errors gracefully and skips invalid entries.
+    Vectorized is_valid_timestamp over a column of timestamps.
 
     Args:
-        data: List of dictionaries containing the data.
-        ecu_name: Filter data by specific ECU name(s).
+        timestamps: Timestamp column of the input data.
 
     Returns:
-        List of filtered and processed data entries with numeric values.
+        np.ndarray: Boolean mask of the valid timestamps.
     """
-    filtered_data = []
-    skipped_entries = 0
+    if (pd.api.types.is_numeric_dtype(timestamps)
+            and not pd.api.types.is_bool_dtype(timestamps)):
+        # One compare per bound over the raw array, NaN (missing timestamp) compares False
+        values = timestamps.to_numpy(dtype=np.float64)
+        return (values > 0) & (values <= MAX_TIMESTAMP)
+    # Mixed column (e.g. strings among numbers), check each value
+    return np.fromiter(map(is_valid_timestamp, timestamps), dtype=bool, count=len(timestamps))
+
+def _decode_numeric(raw_data: str) -> tuple[tuple[str, float], ...]:
+    """
+    Parse one data field and keep its numeric values.
 
-    # Convert ecu_name to lowercase for case-insensitive matching if provided
-    ecu_filters = [name.lower() for name in ecu_name] if ecu_name else None
-
-    for entry in data:
-        # Skip entries with invalid timestamp
-        timestamp = entry.get("timestamp")
-        if not is_valid_timestamp(timestamp):
-            logging.debug("Skipping entry with invalid timestamp: %s",
-                         str(entry)[:50] + "..." if len(str(entry)) > 50 else str(entry))
-            skipped_entries += 1
-            continue
+    Args:
+        raw_data: Raw data field of an entry.
 
-        # Skip entries that don't match the ECU filter (if provided)
-        if ecu_filters and entry.get("name", "").lower() not in ecu_filters:
-            continue
+    Returns:
+        tuple: (signal name, value) pairs, empty if the field is invalid or has no numbers.
+    """
+    parsed_data = safe_parse_json(raw_data)
+    if not parsed_data or not isinstance(parsed_data, dict):
+        logging.debug("Skipping entry with invalid data format: %s",
+                     raw_data[:50] + "..." if len(raw_data) > 50 else raw_data)
+        return ()
+
+    # Filter non-numeric values, keep only numeric values.
+    # The entry timestamp is the one windows are built on, so a signal with
+    # the same name must not replace or duplicate it.
+    numeric_values = tuple(
+        (k, float(v))
+        for k, v in parsed_data.items()
+        if isinstance(v,(int, float)) and k != "timestamp"
+    )
+    if not numeric_values:
+        logging.debug("Skipping entry with no numeric values: %s",
+             str(parsed_data)[:50] + "..." if len(str(parsed_data)) > 50 else str(parsed_data))
+    return numeric_values
+
+def _process_chunk(timestamps: List[float], raw_data_list: List[Any]) -> tuple[
+        List[float], Dict[str, tuple[List[int], List[float]]], int]:
+    """
+    Decode the data fields of already filtered entries into columns.
+    This is the worker of filter_and_process_data.
 
-        # Process data field
-        raw_data = entry.get("data")
-        if not raw_data:
+    Args:
+        timestamps: Valid timestamps of the entries.
+        raw_data_list: Raw data fields of the same entries.
+
+    Returns:
+        tuple: Timestamps of the kept entries, numeric signals as
+        {name: (row indices, values)} and the number of skipped entries.
+    """
+    kept_timestamps = []
+    columns = {}
+    skipped_entries = 0
+    # CAN payloads repeat a lot, so every distinct data string is decoded only once
+    decoded = {}
+
+    for timestamp, raw_data in zip(timestamps, raw_data_list):
+        # Process data field, a missing field comes from the DataFrame as NaN
+        if not raw_data or not isinstance(raw_data, str):
             logging.debug("Skipping entry with empty data field")
             skipped_entries += 1
             continue
 
         # Parse the data field
-        parsed_data = safe_parse_json(raw_data)
-        if not parsed_data:
-            logging.debug("Skipping entry with invalid data format: %s",
-                         raw_data[:50] + "..." if len(raw_data) > 50 else raw_data)
-            skipped_entries += 1
-            continue
-
-        # Filter non-numeric values, keep only numeric values
-        numeric_values = {
-            k: float(v)
-            for k, v in parsed_data.items()
-            if isinstance(v,(int, float))
-        }
-        # Skip if nothing numeric
+        numeric_values = decoded.get(raw_data)
+        if numeric_values is None:
+            numeric_values = decoded[raw_data] = _decode_numeric(raw_data)
+        # Skip if invalid or nothing numeric
         if not numeric_values:
-            logging.debug("Skipping entry with no numeric values: %s",
-                 str(parsed_data)[:50] + "..." if len(str(parsed_data)) > 50 else str(parsed_data))
             skipped_entries += 1
             continue
 
-        # Add numeric values to filtered data
-        filtered_data.append({
-            "timestamp": float(timestamp),
-            **numeric_values
-        })
+        # Append numeric values to their columns
+        row = len(kept_timestamps)
+        kept_timestamps.append(timestamp)
+        for key, value in numeric_values:
+            column = columns.get(key)
+            if column is None:
+                column = columns[key] = ([], [])
+            column[0].append(row)
+            column[1].append(value)
+
+    return kept_timestamps, columns, skipped_entries
+
+def _valid_entries(data: Records, ecu_name: Optional[List[str]]) -> tuple[
+        List[float], List[Any], int]:
+    """
+    Drops invalid timestamps and other ECUs on whole columns, so that only
+    the surviving entries have their data field parsed.
+    A DataFrame from read_file is used as is, without copying it first.
+
+    Args:
+        data: List of dictionaries or a DataFrame containing the data.
+        ecu_name: Filter data by specific ECU name(s).
+
+    Returns:
+        tuple: Timestamps and raw data fields of the kept entries and
+        the number of entries with an invalid timestamp.
+    """
+    # Convert ecu_name to lowercase for case-insensitive matching if provided
+    ecu_filters = frozenset(name.lower() for name in ecu_name) if ecu_name else None
+
+    if isinstance(data, pd.DataFrame) and {"name", "timestamp", "data"} <= set(data.columns):
+        df = data
+    else:
+        df = pd.DataFrame(data, columns=["name", "timestamp", "data"])
+    valid = _valid_timestamp_mask(df["timestamp"])
+    invalid_count = len(df) - int(valid.sum())
+    if invalid_count:
+        logging.debug("Skipping %d entries with invalid timestamp", invalid_count)
+    if ecu_filters:
+        valid &= _match_names(
+            df["name"].to_numpy(dtype=object),
+            lambda name: isinstance(name, str) and name.lower() in ecu_filters)
+    return (df["timestamp"].to_numpy()[valid].astype(float).tolist(),
+            df["data"].to_numpy()[valid].tolist(),
+            invalid_count)
+
+def _process_columns(data: Records, ecu_name: Optional[List[str]]) -> tuple[
+        List[float], Dict[str, tuple[List[int], List[float]]]]:
+    """
+    Runs _process_chunk over the whole input.
+
+    Args:
+        data: List of dictionaries or a DataFrame containing the data.
+        ecu_name: Filter data by specific ECU name(s).
+
+    Returns:
+        tuple: Timestamps and sparse numeric columns, see _process_chunk.
+    """
+    # First pass: filter the entries on whole columns
+    valid_timestamps, raw_data_list, invalid_count = _valid_entries(data, ecu_name)
+
+    # Second pass: parse the data fields
+    timestamps, columns, skipped_entries = _process_chunk(valid_timestamps, raw_data_list)
 
+    logging.debug("Skipped %d entries", skipped_entries + invalid_count)
+    return timestamps, columns
+
+def filter_and_process_data(data: Records, ecu_name: List[str] = None) -> List[Dict]:
+    """
+    Filter and process data based on ECU name and convert data fields to numeric values.
+    Handles errors gracefully and skips invalid entries.
+
+    Args:
+        data: List of dictionaries or a DataFrame containing the data.
+        ecu_name: Filter data by specific ECU name(s).
 
+    Returns:
+        List of filtered and processed data entries with numeric values.
+    """
+    timestamps, columns = _process_columns(data, ecu_name)
+
+    filtered_data = [{"timestamp": timestamp} for timestamp in timestamps]
+    for key, (rows, values) in columns.items():
+        for row, value in zip(rows, values):
+            filtered_data[row][key] = value
     return filtered_data
 
-def create_windows(
-    data: List[Dict],
-    window_length: float,
-    step: float = None) -> pd.DataFrame:
+def filter_and_process_frame(data: Records, ecu_name: List[str] = None) -> pd.DataFrame:
     """
-    Creates time-based windows from sorted data and calculates statistics for each window.
+    Same as filter_and_process_data, but the result is built straight into
+    a DataFrame from the decoded columns without a dict per entry.
 
     Args:
-        data: List of dictionaries containing the data.
+        data: List of dictionaries or a DataFrame containing the data.
+        ecu_name: Filter data by specific ECU name(s).
+
+    Returns:
+        DataFrame with a timestamp column and one column per numeric signal,
+        NaN where an entry does not have the signal.
+    """
+    timestamps, columns = _process_columns(data, ecu_name)
+
+    # One preallocated float block, a row per column, that the DataFrame
+    # wraps without copying. Each column stays contiguous in memory.
+    block = np.full((len(columns) + 1, len(timestamps)), np.nan)
+    block[0] = timestamps
+    for block_row, (rows, values) in enumerate(columns.values(), start=1):
+        block[block_row, rows] = values
+    return pd.DataFrame(block.T, columns=["timestamp", *columns], copy=False)
+
+def _windowed_frame(
+        data: Records,
+        window_length: float,
+        step: Optional[float],
+        ecu_name: Optional[List[str]],
+        empty_as_error: bool = False) -> Optional[pd.DataFrame]:
+    """
+    Filters the data and calculates the window statistics shared by every output format.
+
+    Args:
+        data: List of dictionaries or a DataFrame containing the data.
         window_length: Length of each window in seconds.
         step: How many seconds the window moves forward (default: same as window length).
+        ecu_name: Filter data by specific ECU name(s).
+        empty_as_error: Log empty filter or window results as errors
+            instead of debug and info messages.
 
     Returns:
-        DataFrame containing statistics for each window.
+        Optional[pd.DataFrame]: Statistics for each window, or None if there is nothing to write.
     """
-    # Return empty DataFrame if no data provided
-    if not data:
-        logging.debug("No valid entries to process")
-        return pd.DataFrame()
-
-    # Convert list of dicts to DataFrame and sort chronologically
-    try:
-        df = pd.DataFrame(data)
+    if step is not None and step <= 0:
+        logging.error("Step size must be greater than zero.")
+        return None
 
-        # Validate timestamp column exists
-        if "timestamp" not in df.columns:
-            logging.error("No timestamp column found in data")
-            return pd.DataFrame()
+    # Filter and process the data
+    filtered_data = filter_and_process_frame(data, ecu_name)
 
-        df = df.sort_values("timestamp")
-    except Exception as e:
-        logging.error("Error creating DataFrame: %s", e)
-        return pd.DataFrame()
+    if filtered_data.empty:
+        logging.log(logging.ERROR if empty_as_error else logging.DEBUG,
+                    "No valid entries to process after filtering")
+        return None
 
-    # If no step size provided, use window length
-    if step is None:
-        step = window_length
+    # Create windows and calculate statistics
+    results_df = create_windows(filtered_data, window_length, step)
 
-    results = []
+    if results_df.empty:
+        logging.log(logging.ERROR if empty_as_error else logging.INFO,
+                    "No data found in specified windows")
+        return None
 
-    # Get time range of data
-    try:
-        min_time = df["timestamp"].min()
-        max_time = df["timestamp"].max()
-    except Exception as e:
-        logging.error("Error calculating time range: %s", e)
-        return pd.DataFrame()
-
-    start_time = min_time
-    window_index = 0
-
-    # Create windows by sliding over time range
-    while start_time <= max_time:
-        end_time = start_time + window_length
-        try:
-            # Get data points within current window
-            window_df = df[(df["timestamp"] >= start_time) & (df["timestamp"] < end_time)]
-
-            if not window_df.empty:
-                # Get numeric columns except timestamp
-                numeric_columns = window_df.select_dtypes(include=["number"]).columns
-                numeric_columns = [col for col in numeric_columns if col != "timestamp"]
-
-                # Skip window if no numeric data found
-                if not numeric_columns:
-                    logging.debug("No numeric columns found in window %d", window_index)
-                    start_time += step
-                    window_index += 1
-                    continue
-
-                # Calculate statistics for numeric columns
-                stats = window_df[numeric_columns].agg(["min", "max", "mean", "std"]).to_dict()
-
-                # Flatten stats dict into format: stat_column: value
-                flat_stats = {f"{stat}_{key}": value
-                              for key, values in stats.items()
-                              for stat, value in values.items()}
-
-                # Store window results with metadata
-                results.append({
-                    "window_index": window_index,
-                    "window_start": start_time,
-                    "window_end": end_time,
-                    **flat_stats
-                })
-
-                window_index += 1
-        except Exception as e:
-            logging.error("Error processing window at %f: %s", start_time, e)
-
-        # Move window forward by step size
-        start_time += step
-
-    # Convert results to DataFrame
-    return pd.DataFrame(results)
+    return results_df
 
 def dict_to_csv(
-        data: List[Dict],
+        data: Records,
         window_length: float,
         csv_filename: str,
         step: float = None,
@@ -403,32 +610,18 @@ def dict_to_csv(
     Process JSON data, create windows, and save results to CSV.
 
     Args:
-        data: List of dictionaries containing the data.
+        data: List of dictionaries or a DataFrame containing the data.
         window_length: Length of each window in seconds.
         csv_filename: Output CSV filename.
         step: How many seconds the window moves forward (default: same as window length).
         ecu_name: Filter data by specific ECU name.
     """
-    if not data:
+    if data is None or len(data) == 0:
         logging.error("No data found from JSON")
         return
 
-    if step is not None and step <= 0:
-        logging.error("Step size must be greater than zero.")
-        return
-
-    # Filter and process the data
-    filtered_data = filter_and_process_data(data, ecu_name)
-
-    if not filtered_data:
-        logging.debug("No valid entries to process after filtering")
-        return
-
-    # Create windows and calculate statistics
-    results_df = create_windows(filtered_data, window_length, step)
-
-    if results_df.empty:
-        logging.info("No data found in specified windows")
+    results_df = _windowed_frame(data, window_length, step, ecu_name)
+    if results_df is None:
         return
 
     # Ensure output filename has .csv extension
@@ -436,14 +629,36 @@ def dict_to_csv(
         csv_filename += ".csv"
 
     try:
-        # Write CSV using Pandas
-        results_df.to_csv(csv_filename, sep=";", index=False, encoding="utf-8-sig")
+        # Write CSV with the stdlib writer through a 1 MB buffer,
+        # NaN (e.g. std of a single value) is written as an empty field like pandas does
+        rows = results_df.astype(object).where(results_df.notna(), None)
+        with open(csv_filename, "w", newline="", encoding="utf-8-sig",
+                  buffering=CSV_BUFFER_SIZE) as f:
+            writer = csv.writer(f, delimiter=";", lineterminator="\n")
+            writer.writerow(results_df.columns)
+            writer.writerows(rows.itertuples(index=False, name=None))
         logging.info("CSV file saved: %s", csv_filename)
     except Exception as e:
         logging.error("Error saving CSV file: %s", e)
 
+def _frame_to_records(df: pd.DataFrame) -> List[Dict]:
+    """
+    Converts a DataFrame to a list of row dicts for orjson.
+    Each column is turned into Python values with one tolist() call and the
+    rows are zipped together, which is faster than DataFrame.to_dict('records').
+
+    Args:
+        df: DataFrame to convert.
+
+    Returns:
+        List[Dict]: One dict per row, column name to value.
+    """
+    columns = [str(column) for column in df.columns]
+    values = [df[column].tolist() for column in df.columns]
+    return [dict(zip(columns, row)) for row in zip(*values)]
+
 def dict_to_json(
-        data: List[Dict],
+        data: Records,
         json_filename: str,
         window_length: Optional[float] = None,
         step: Optional[float] = None,
@@ -454,54 +669,82 @@ def dict_to_json(
     and calculating statistics before converting to JSON.
 
     Args:
-        data (List[Dict]): The list of dictionaries to convert.
+        data (Records): The list of dictionaries or DataFrame to convert.
         json_filename (str): The name of the output JSON file.
         window_length (Optional[float]): Length of each window in seconds. If provided, data will be processed.
         step (Optional[float]): How many seconds the window moves forward (default: same as window length).
         ecu_name (Optional[List[str]]): Filter data by specific ECU name(s).
     """
-    if not data:
+    if data is None or len(data) == 0:
         logging.error("No data to convert to JSON")
         return
 
     # Process data if window_length is provided
     if window_length is not None:
-        if step is not None and step <= 0:
-            logging.error("Step size must be greater than zero.")
-            return
-
-        # Filter and process the data
-        filtered_data = filter_and_process_data(data, ecu_name)
-
-        if not filtered_data:
-            logging.error("No valid entries to process after filtering")
-            return
-
-        # Create windows and calculate statistics
-        results_df = create_windows(filtered_data, window_length, step)
-
-        if results_df.empty:
-            logging.error("No data found in specified windows")
+        results_df = _windowed_frame(data, window_length, step, ecu_name, empty_as_error=True)
+        if results_df is None:
             return
 
         # Convert DataFrame to list of dictionaries
-        data = results_df.to_dict('records')
+        data = _frame_to_records(results_df)
+    elif isinstance(data, pd.DataFrame):
+        data = _frame_to_records(data)
 
     # Ensure filename ends with .json
     if not json_filename.endswith(".json"):
         json_filename += ".json"
 
     try:
-        # Non-buffered writing
-        with open(json_filename, "w", encoding="utf-8", buffering=1) as f:
+        # Binary writing of the whole document at once, orjson already returns UTF-8 bytes
+        with open(json_filename, "wb") as f:
             logging.debug("Saving to %s...", json_filename)
-            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode("utf-8"))
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
         logging.info("%s saved successfully", json_filename)
     except (orjson.JSONEncodeError, ValueError, TypeError) as e:
         logging.error("Error in JSON conversion: %s", e)
     except Exception as e:
         logging.critical("Unexpected error: %s", e)
 
+def dict_to_parquet(
+        data: Records,
+        window_length: float,
+        parquet_filename: str,
+        step: float = None,
+        ecu_name: List[str] = None):
+    """
+    Process JSON data, create windows, and save results to a Parquet file.
+
+    Args:
+        data: List of dictionaries or a DataFrame containing the data.
+        window_length: Length of each window in seconds.
+        parquet_filename: Output Parquet filename.
+        step: How many seconds the window moves forward (default: same as window length).
+        ecu_name: Filter data by specific ECU name.
+    Note:
+        Parquet stores the float64 statistics as typed, zstd compressed columns,
+        so large window tables are smaller and faster to write than CSV.
+        Writing needs the optional pyarrow package.
+    """
+    if data is None or len(data) == 0:
+        logging.error("No data found from JSON")
+        return
+
+    results_df = _windowed_frame(data, window_length, step, ecu_name)
+    if results_df is None:
+        return
+
+    # Ensure output filename has .parquet extension
+    if not parquet_filename.endswith(".parquet"):
+        parquet_filename += ".parquet"
+
+    try:
+        results_df.to_parquet(parquet_filename, compression="zstd", index=False)
+        logging.info("Parquet file saved: %s", parquet_filename)
+    except ImportError as e:
+        logging.error("Parquet output needs pyarrow, install it with pip install pyarrow: %s", e)
+    except (OSError, ValueError, TypeError, NotImplementedError) as e:
+        logging.error("Error saving Parquet file: %s", e)
+
 def get_available_output_options() -> List[str]:
     """
     Returns a list of available output options.
@@ -512,7 +755,7 @@ def get_available_output_options() -> List[str]:
         List[str]: List of available output option flags.
     """
     # Add new output options here as they are implemented
-    return ["-csv", "--output-csv", "-json", "--output-json"]
+    return ["-csv", "--output-csv", "-json", "--output-json", "-parquet", "--output-parquet"]
 
 def check_output_options(args: argparse.Namespace) -> bool:
     """
@@ -526,7 +769,54 @@ def check_output_options(args: argparse.Namespace) -> bool:
     """
     # Check if any output option is specified
     # Add new output options here as they are implemented
-    return bool(args.output_csv or args.output_json)
+    return bool(args.output_csv or args.output_json or args.output_parquet)
+
+def _print_ecu_names(file_name: str):
+    """
+    Prints the ECU names found in the file, used by -list / --list-ecus.
+
+    Args:
+        file_name: Path to the JSON file.
+    """
+    # Only the names are needed for listing, the entries are never parsed
+    ecu_names = stream_ecu_names(file_name)
+    if ecu_names is None:
+        logging.error("Failed to read the input file.")
+    elif ecu_names:
+        print(f"ECU names found in the data: {', '.join(ecu_names)}")
+    else:
+        print("No ECU names found in the data.")
+
+def _write_outputs(args: argparse.Namespace, data: pd.DataFrame, ecu_filter: List[str]):
+    """
+    Writes the windows of the data to every output format given in the arguments.
+
+    Args:
+        args: Parsed command line arguments.
+        data: Data read from the input file.
+        ecu_filter: Lowercase ECU names to keep, or None for all.
+    """
+    if not check_output_options(args):
+        # Get available output options for error message
+        options = get_available_output_options()
+        # Format options for display (e.g., "-csv, --output-csv, -json, --output-json")
+        formatted_options = ", ".join(options)
+        # Display error message
+        print("Error: No output format specified. "
+              f"Please use one of the following options: {formatted_options}")
+        return
+
+    # read_file already dropped the entries of other ECUs
+    if ecu_filter and len(data) == 0:
+        logging.error("No entries match the ECU filter: %s", ", ".join(args.ecu))
+        return
+
+    if args.output_csv:
+        dict_to_csv(data, args.length, args.output_csv, args.step, ecu_filter)
+    if args.output_json:
+        dict_to_json(data, args.output_json, args.length, args.step, ecu_filter)
+    if args.output_parquet:
+        dict_to_parquet(data, args.length, args.output_parquet, args.step, ecu_filter)
 
 def main():
     """
@@ -537,7 +827,7 @@ def main():
     #-list/--list-ecus can only be used with file and optional logging level (only -f/--file, -list/--list-ecus and log loglevel)
     if args.list_ecus:
         other_args = any([
-            args.output_csv, args.output_json,
+            args.output_csv, args.output_json, args.output_parquet,
             args.ecu, args.length, args.step
         ])
         if other_args:
@@ -553,8 +843,12 @@ def main():
 
     try:
 
-        # Read the JSON file
-        data = read_file(args.file)
+        if args.list_ecus:
+            _print_ecu_names(args.file)
+            return
+
+        # Read the JSON file, entries of other ECUs are dropped while reading
+        data = read_file(args.file, args.ecu)
         if data is None:
             logging.error("Failed to read or parse the input file.")
             return
@@ -564,30 +858,9 @@ def main():
             ecu_filter = [name.lower() for name in ecu_filter]
             logging.debug("Filtering by ECU names: %s", ", ".join(ecu_filter))
 
-        if args.list_ecus:
-            if data:
-                ecu_names = parse_ecu_names(data)
-                if ecu_names:
-                    print(f"ECU names found in the data: {', '.join(ecu_names)}")
-                else:
-                    print("No ECU names found in the data.")
-            return
-
         # If the length argument is provided, check if output options are specified
         if args.length:
-            if not check_output_options(args):
-                # Get available output options for error message
-                options = get_available_output_options()
-                # Format options for display (e.g., "-csv, --output-csv, -json, --output-json")
-                formatted_options = ", ".join(options)
-                # Display error message
-                print(f"Error: No output format specified. Please use one of the following options: {formatted_options}")
-                return
-
-            if args.output_csv:
-                dict_to_csv(data, args.length, args.output_csv, args.step, ecu_filter)
-            if args.output_json:
-                dict_to_json(data, args.output_json, args.length, args.step, ecu_filter)
+            _write_outputs(args, data, ecu_filter)
         else:
             argparser.print_help()
     except Exception as e:
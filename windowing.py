@@ -0,0 +1,276 @@
+"""
+File: windowing.py
+Authors: Johan Sääskilahti, Atte Rajavaara, Minna Repo, Topias Hämäläinen
+Description: Time-based windows and their statistics, used by windower.py
+"""
+
+import os
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Union
+import numpy as np
+import pandas as pd
+
+
+# Input entries as a list of dicts or as a DataFrame with one column per field
+Records = Union[List[Dict], pd.DataFrame]
+
+_THREAD_POOL: Optional[ThreadPoolExecutor] = None
+# Statistics calculated for every numeric column of a window
+WINDOW_STATS = ("min", "max", "mean", "std")
+# Max entries gathered at once when calculating overlapping windows
+GATHER_BATCH_SIZE = 1 << 22
+
+
+def _window_bounds(
+        timestamps: np.ndarray,
+        window_length: float,
+        step: float) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Finds the non-empty windows of sorted timestamps.
+
+    Args:
+        timestamps: Timestamps of the data in ascending order.
+        window_length: Length of each window in seconds.
+        step: How many seconds the window moves forward.
+
+    Returns:
+        tuple: Start and end time, index of the first entry and number of
+        entries of each window that has entries.
+    Note:
+        Window starts are accumulated the same way as repeatedly adding step,
+        so the start times stay identical to stepping one window at a time.
+    """
+    min_time = timestamps[0]
+    max_time = timestamps[-1]
+    window_count = int((max_time - min_time) // step) + 2
+    starts = np.cumsum(np.concatenate(([min_time], np.full(window_count - 1, step))))
+    starts = starts[starts <= max_time]
+    ends = starts + window_length
+
+    # Index range [first, last) of the entries inside each window, skip empty windows
+    first = np.searchsorted(timestamps, starts, side="left")
+    last = np.searchsorted(timestamps, ends, side="left")
+    non_empty = last > first
+    return starts[non_empty], ends[non_empty], first[non_empty], (last - first)[non_empty]
+
+def _reduce_windows(
+        window_values: np.ndarray,
+        offsets: np.ndarray,
+        counts: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Calculates the statistics of windows stored one after another in window_values.
+
+    Args:
+        window_values: Entries of all windows, each window starting at its offset.
+        offsets: Index of the first entry of each window in window_values.
+        counts: Number of entries in each window.
+
+    Returns:
+        Dict[str, np.ndarray]: One array per statistic with a value per window.
+    """
+    with np.errstate(invalid="ignore", divide="ignore"):
+        valid = ~np.isnan(window_values)
+        count = np.add.reduceat(valid.astype(np.int64), offsets)
+        total = np.add.reduceat(np.where(valid, window_values, 0.0), offsets)
+        minimum = np.fmin.reduceat(window_values, offsets)
+        maximum = np.fmax.reduceat(window_values, offsets)
+
+        mean = total / count
+        # Two-pass variance like pandas, squared deviations from the window mean
+        deviation = np.where(valid, window_values - np.repeat(mean, counts), 0.0)
+        squares = np.add.reduceat(deviation * deviation, offsets)
+        std = np.where(count > 1, np.sqrt(squares / (count - 1)), np.nan)
+
+    return {"min": minimum, "max": maximum, "mean": mean, "std": std}
+
+def _window_statistics(
+        values: np.ndarray,
+        starts: np.ndarray,
+        counts: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Calculates min, max, mean and std of values[start:start + count] for every window.
+    NaN values are skipped, std uses ddof=1 and all results are float64, like pandas agg.
+    The sums are accumulated in a different order than in pandas, so mean and std
+    can differ from pandas agg by floating point rounding (a few ULPs).
+
+    Args:
+        values: One column of the data, sorted by timestamp.
+        starts: Index of the first entry of each window.
+        counts: Number of entries in each window, all greater than zero.
+
+    Returns:
+        Dict[str, np.ndarray]: One array per statistic with a value per window.
+    Note:
+        The entries of each window are gathered next to each other so every
+        statistic is a single np.ufunc.reduceat call. Overlapping windows
+        (step < window_length) copy entries once per window they are in,
+        so the windows are processed in batches of about GATHER_BATCH_SIZE entries.
+        Back to back windows are reduced straight from a slice of values.
+    """
+    values = values.astype(np.float64, copy=False)
+    results = {stat: [] for stat in WINDOW_STATS}
+    bounds = np.cumsum(counts)
+
+    # Windows that do not overlap and have no gaps between them (step == window_length)
+    # are already stored one after another, so a slice replaces the gather
+    if np.array_equal(starts[1:], starts[:-1] + counts[:-1]):
+        offsets = starts - starts[0]
+        return _reduce_windows(values[starts[0]:starts[0] + bounds[-1]], offsets, counts)
+
+    batch_start = 0
+    while batch_start < len(counts):
+        # Take windows until the batch is full, but always at least one
+        limit = (bounds[batch_start - 1] if batch_start else 0) + GATHER_BATCH_SIZE
+        batch_end = max(int(np.searchsorted(bounds, limit, side="right")), batch_start + 1)
+        batch_counts = counts[batch_start:batch_end]
+        offsets = np.zeros(len(batch_counts), dtype=np.int64)
+        np.cumsum(batch_counts[:-1], out=offsets[1:])
+
+        # Gather the entries of every window one after another
+        index = np.repeat(starts[batch_start:batch_end] - offsets, batch_counts)
+        index += np.arange(len(index))
+
+        for stat, array in _reduce_windows(values[index], offsets, batch_counts).items():
+            results[stat].append(array)
+        batch_start = batch_end
+
+    return {stat: np.concatenate(arrays) for stat, arrays in results.items()}
+
+def _get_thread_pool() -> ThreadPoolExecutor:
+    """
+    Returns the shared thread pool used for per-column window statistics,
+    creating it on first use.
+    """
+    global _THREAD_POOL  # pylint: disable=global-statement
+    if _THREAD_POOL is None:
+        _THREAD_POOL = ThreadPoolExecutor(max_workers=os.cpu_count())
+    return _THREAD_POOL
+
+def _sorted_timestamps(
+        data: Records) -> Optional[tuple[pd.DataFrame, np.ndarray, Optional[np.ndarray]]]:
+    """
+    Converts the data to a DataFrame and checks that its timestamps are in time order.
+
+    Returns:
+        Optional[tuple]: The DataFrame, its sorted timestamps and the order that sorts
+        the rows (None if already sorted), or None if there is nothing to window.
+    """
+    # Return None if no data provided
+    if data is None or len(data) == 0:
+        logging.debug("No valid entries to process")
+        return None
+
+    # Convert list of dicts to DataFrame and sort chronologically
+    try:
+        df = data if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
+
+        # Validate timestamp column exists
+        if "timestamp" not in df.columns:
+            logging.error("No timestamp column found in data")
+            return None
+
+        # Dumps are usually already in time order, one pass over the timestamps
+        # is enough to check that and skip sorting every column
+        timestamps = df["timestamp"].to_numpy()
+        if np.all(timestamps[1:] >= timestamps[:-1]):
+            order = None
+        else:
+            order = np.argsort(timestamps, kind="stable")
+            timestamps = timestamps[order]
+    except Exception as e:
+        logging.error("Error creating DataFrame: %s", e)
+        return None
+
+    return df, timestamps, order
+
+def _columns_window_statistics(
+        df: pd.DataFrame,
+        numeric_columns: List[str],
+        order: Optional[np.ndarray],
+        first: np.ndarray,
+        counts: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Calculates the window statistics of every numeric column, format: stat_column.
+    Columns that fail are logged and left out.
+    """
+    def column_statistics(column: str) -> Optional[Dict[str, np.ndarray]]:
+        try:
+            values = df[column].to_numpy()
+            if order is not None:
+                values = values[order]
+            return _window_statistics(values, first, counts)
+        except Exception as e:
+            logging.error("Error processing column %s: %s", column, e)
+            return None
+
+    # Columns are independent and numpy releases the GIL in its loops,
+    # so wide data is spread over a thread pool
+    if len(numeric_columns) > 1 and (os.cpu_count() or 1) > 1:
+        column_stats = _get_thread_pool().map(column_statistics, numeric_columns)
+    else:
+        column_stats = map(column_statistics, numeric_columns)
+
+    results = {}
+    for column, stats in zip(numeric_columns, column_stats):
+        if stats is None:
+            continue
+        for statistic in WINDOW_STATS:
+            results[f"{statistic}_{column}"] = stats[statistic]
+    return results
+
+def create_windows(
+    data: Records,
+    window_length: float,
+    step: float = None) -> pd.DataFrame:
+    """
+    Creates time-based windows from sorted data and calculates statistics for each window.
+
+    Args:
+        data: List of dictionaries or a DataFrame containing the data.
+        window_length: Length of each window in seconds.
+        step: How many seconds the window moves forward (default: same as window length).
+
+    Returns:
+        DataFrame containing statistics for each window.
+    Note:
+        The data is sorted once, unless it is already in time order, and the window
+        boundaries are looked up with np.searchsorted, instead of masking the whole
+        data for every window.
+    """
+    sorted_data = _sorted_timestamps(data)
+    if sorted_data is None:
+        return pd.DataFrame()
+    df, timestamps, order = sorted_data
+
+    # If no step size provided, use window length
+    if step is None:
+        step = window_length
+
+    if step <= 0:
+        logging.error("Step size must be greater than zero.")
+        return pd.DataFrame()
+
+    # Get numeric columns except timestamp
+    numeric_columns = df.select_dtypes(include=["number"]).columns
+    numeric_columns = [col for col in numeric_columns if col != "timestamp"]
+
+    # No window can have statistics without numeric data
+    if not numeric_columns:
+        logging.debug("No numeric columns found in data")
+        return pd.DataFrame()
+
+    try:
+        starts, ends, first, counts = _window_bounds(timestamps, window_length, step)
+    except Exception as e:
+        logging.error("Error calculating time range: %s", e)
+        return pd.DataFrame()
+
+    results = {
+        "window_index": np.arange(len(starts)),
+        "window_start": starts,
+        "window_end": ends
+    }
+    # Calculate statistics for numeric columns, format: stat_column
+    results.update(_columns_window_statistics(df, numeric_columns, order, first, counts))
+    return pd.DataFrame(results)